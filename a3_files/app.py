@@ -10,15 +10,18 @@ __version__ = "1.1.0"
 __copyright__ = "The University of Queensland, 2019"
 
 import math
+import time
 import tkinter as tk
 
-from typing import Tuple, List
+from bisect import bisect_left, bisect_right
+from functools import partial
+from typing import Tuple, List, Dict, Set, Optional, Callable
 
 import pymunk
 
 from game.block import Block, MysteryBlock
 from game.entity import Entity, BoundaryWall
-from game.mob import Mob, CloudMob, Fireball
+from game.mob import Mob, MobType, CloudMob, Fireball
 from game.item import DroppedItem, Coin
 from game.view import GameView, ViewRenderer
 from game.world import World
@@ -26,9 +29,19 @@ from game.world import World
 from level import load_world, WorldBuilder
 from player import Player
 
-BLOCK_SIZE = 2 ** 4
+# Blocks are a power of 2 in size so grid coordinates can be scaled with a shift
+BLOCK_SIZE_LOG2 = 4
+BLOCK_SIZE = 2 ** BLOCK_SIZE_LOG2
 MAX_WINDOW_SIZE = (1080, math.inf)
 
+# The real time (in seconds) represented by one step of the world physics
+PHYSICS_STEP = 0.01
+# The most physics steps taken in one tick before dropping the remaining backlog
+MAX_PHYSICS_STEPS = 4
+# Delays (in milliseconds) between physics ticks and between canvas redraws
+PHYSICS_INTERVAL = 16
+RENDER_INTERVAL = 33
+
 GOAL_SIZES = {
     "flag": (0.2, 9),
     "tunnel": (2, 2)
@@ -50,6 +63,28 @@ MOBS = {
     '&': "cloud"
 }
 
+# The level characters of each kind of entity
+_BLOCK_KEYS = tuple(BLOCKS)
+_ITEM_KEYS = tuple(ITEMS)
+_MOB_KEYS = tuple(MOBS)
+
+# Constructors for the entity of each level character
+_BLOCK_FACTORIES = {
+    '#': partial(Block, 'brick'),
+    '%': partial(Block, 'brick_base'),
+    '?': MysteryBlock,
+    '$': partial(MysteryBlock, drop="coin", drop_range=(3, 6)),
+    '^': partial(Block, 'cube')
+}
+
+_ITEM_FACTORIES = {
+    'C': Coin
+}
+
+_MOB_FACTORIES = {
+    '&': CloudMob
+}
+
 
 def create_block(world: World, block_id: str, x: int, y: int, *args):
     """Create a new block instance and add it to the world based on the block_id.
@@ -60,15 +95,7 @@ def create_block(world: World, block_id: str, x: int, y: int, *args):
         x (int): The x coordinate of the block.
         y (int): The y coordinate of the block.
     """
-    block_id = BLOCKS[block_id]
-    if block_id == "mystery_empty":
-        block = MysteryBlock()
-    elif block_id == "mystery_coin":
-        block = MysteryBlock(drop="coin", drop_range=(3, 6))
-    else:
-        block = Block(block_id)
-
-    world.add_block(block, x * BLOCK_SIZE, y * BLOCK_SIZE)
+    world.add_block(_BLOCK_FACTORIES[block_id](), x << BLOCK_SIZE_LOG2, y << BLOCK_SIZE_LOG2)
 
 
 def create_item(world: World, item_id: str, x: int, y: int, *args):
@@ -80,13 +107,7 @@ def create_item(world: World, item_id: str, x: int, y: int, *args):
         x (int): The x coordinate of the item.
         y (int): The y coordinate of the item.
     """
-    item_id = ITEMS[item_id]
-    if item_id == "coin":
-        item = Coin()
-    else:
-        item = DroppedItem(item_id)
-
-    world.add_item(item, x * BLOCK_SIZE, y * BLOCK_SIZE)
+    world.add_item(_ITEM_FACTORIES[item_id](), x << BLOCK_SIZE_LOG2, y << BLOCK_SIZE_LOG2)
 
 
 def create_mob(world: World, mob_id: str, x: int, y: int, *args):
@@ -98,23 +119,41 @@ def create_mob(world: World, mob_id: str, x: int, y: int, *args):
         x (int): The x coordinate of the mob.
         y (int): The y coordinate of the mob.
     """
-    mob_id = MOBS[mob_id]
-    if mob_id == "cloud":
-        mob = CloudMob()
-    elif mob_id == "fireball":
-        mob = Fireball()
-    else:
-        mob = Mob(mob_id, size=(1, 1))
-
-    world.add_mob(mob, x * BLOCK_SIZE, y * BLOCK_SIZE)
+    world.add_mob(_MOB_FACTORIES[mob_id](), x << BLOCK_SIZE_LOG2, y << BLOCK_SIZE_LOG2)
 
 
 def create_unknown(world: World, entity_id: str, x: int, y: int, *args):
     """Create an unknown entity."""
-    world.add_thing(Entity(), x * BLOCK_SIZE, y * BLOCK_SIZE,
+    world.add_thing(Entity(), x << BLOCK_SIZE_LOG2, y << BLOCK_SIZE_LOG2,
                     size=(BLOCK_SIZE, BLOCK_SIZE))
 
 
+def scroll_offset(x_position: float, half_screen: float, world_width: float) -> float:
+    """Calculate the horizontal view offset that keeps the player in the center
+    of the screen unless they are near the left or right boundaries.
+
+    Parameters:
+        x_position (float): The x coordinate of the player.
+        half_screen (float): Half of the width of the screen, in pixels.
+        world_width (float): The width of the world, in pixels.
+
+    Returns:
+        (float): The x offset of the logical view from the canvas.
+    """
+    world_size = world_width - half_screen
+
+    # Left side
+    if x_position <= half_screen:
+        return 0
+
+    # Between left and right sides
+    if x_position <= world_size:
+        return half_screen - x_position
+
+    # Right side
+    return half_screen - world_size
+
+
 BLOCK_IMAGES = {
     "brick": "brick",
     "brick_base": "brick_base",
@@ -134,28 +173,31 @@ MOB_IMAGES = {
 class MarioViewRenderer(ViewRenderer):
     """A customised view renderer for a game of mario."""
 
+    def get_player_image(self, shape: pymunk.Shape) -> tk.PhotoImage:
+        """(tk.PhotoImage): Return the image of the player facing its direction of travel."""
+        if shape.body.velocity.x >= 0:
+            return self.load_image("mario_right")
+        return self.load_image("mario_left")
+
+    def get_mystery_block_image(self, instance: MysteryBlock) -> tk.PhotoImage:
+        """(tk.PhotoImage): Return the image of a mystery block for its active state."""
+        if instance.is_active():
+            return self.load_image("coin")
+        return self.load_image("coin_used")
+
     @ViewRenderer.draw.register(Player)
     def _draw_player(self, instance: Player, shape: pymunk.Shape,
                      view: tk.Canvas, offset: Tuple[int, int]) -> List[int]:
-
-        if shape.body.velocity.x >= 0:
-            image = self.load_image("mario_right")
-        else:
-            image = self.load_image("mario_left")
-
-        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y,
-                                  image=image, tags="player")]
+        image = self.get_player_image(shape)
+        x, y = shape.bb.center()
+        return [view.create_image(int(x + offset[0]), int(y), image=image, tags="player")]
 
     @ViewRenderer.draw.register(MysteryBlock)
     def _draw_mystery_block(self, instance: MysteryBlock, shape: pymunk.Shape,
                             view: tk.Canvas, offset: Tuple[int, int]) -> List[int]:
-        if instance.is_active():
-            image = self.load_image("coin")
-        else:
-            image = self.load_image("coin_used")
-
-        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y,
-                                  image=image, tags="block")]
+        image = self.get_mystery_block_image(instance)
+        x, y = shape.bb.center()
+        return [view.create_image(int(x + offset[0]), int(y), image=image, tags="block")]
 
 
 class MarioApp:
@@ -173,17 +215,22 @@ class MarioApp:
         self._master.title("Mario bird")
 
         world_builder = WorldBuilder(BLOCK_SIZE, gravity=(0, 300), fallback=create_unknown)
-        world_builder.register_builders(BLOCKS.keys(), create_block)
-        world_builder.register_builders(ITEMS.keys(), create_item)
-        world_builder.register_builders(MOBS.keys(), create_mob)
+        world_builder.register_builders(_BLOCK_KEYS, create_block)
+        world_builder.register_builders(_ITEM_KEYS, create_item)
+        world_builder.register_builders(_MOB_KEYS, create_mob)
         self._builder = world_builder
 
+        self._renderer = MarioViewRenderer(BLOCK_IMAGES, ITEM_IMAGES, MOB_IMAGES)
+        # Load every image up front so that drawing never has to wait on decoding
+        for image in (*BLOCK_IMAGES.values(), *ITEM_IMAGES.values(), *MOB_IMAGES.values(),
+                      "mario_right", "mario_left", "coin", "coin_used"):
+            self._renderer.load_image(image)
+        self._view = None
+
         self._player = Player(max_health=5)
         self.reset_world('level1.txt')
         self._level_holder = 'level1.txt'
 
-        self._renderer = MarioViewRenderer(BLOCK_IMAGES, ITEM_IMAGES, MOB_IMAGES)
-
         size = tuple(map(min, zip(MAX_WINDOW_SIZE, self._world.get_pixel_size())))
         self._view = GameView(master, size, self._renderer)
         self._view.pack()
@@ -197,16 +244,28 @@ class MarioApp:
         self.status_bar()
         # Wait for window to update before continuing
         master.update_idletasks()
-        self.step()
+        # The window width is only read from tkinter when the window is resized
+        self._screen_width = self._master.winfo_width()
+        self._half_screen = self._screen_width / 2
+        self._master.bind('<Configure>', self._on_resize)
         self._death_action = False
+        self._accumulator = 0.
+        self._last_tick = time.perf_counter()
+        self._last_frame_state = None
+        self._physics_tick()
+        self._render_tick()
 
     def reset_world(self, new_level):
         self._world = load_world(self._builder, new_level)
         self._world.add_player(self._player, BLOCK_SIZE, BLOCK_SIZE)
+        self._world_width = self._world.get_pixel_size()[0]
         self._builder.clear()
         self._setup_collision_handlers()
         self._level_holder = new_level
 
+        self._clear_drawn()
+        # set whenever the world changes in a way that moving entities won't show
+        self._world_dirty = True
 
         self._death_action = False
         self._player.change_health(self._player.get_max_health())
@@ -230,7 +289,9 @@ class MarioApp:
             Level1: loads level1
             level2: loads level2
         """
-        popup = tk.Tk()
+        popup = tk.Toplevel(self._master)
+        popup.transient(self._master)
+        popup.grab_set()
         popup.title("Level select")
         label1 = tk.Label(popup, text="Choose a level")
         label1.pack(side='top')
@@ -245,22 +306,22 @@ class MarioApp:
     def bind(self):
         """Bind all the keyboard events to their event handlers."""
         # jump
-        self._master.bind('<Up>', lambda event: self._jump())
-        self._master.bind('<space>', lambda event: self._jump())
-        self._master.bind('<w>', lambda event: self._jump())
-        self._master.bind('<W>', lambda event: self._jump())
+        self._master.bind('<Up>', self._on_jump)
+        self._master.bind('<space>', self._on_jump)
+        self._master.bind('<w>', self._on_jump)
+        self._master.bind('<W>', self._on_jump)
         # move left
-        self._master.bind('<a>', lambda event: self._move(-50, 0))
-        self._master.bind('<Left>', lambda event: self._move(-500, 0))
-        self._master.bind('<A>', lambda event: self._move(-500, 0))
+        self._master.bind('<a>', self._on_walk_left)
+        self._master.bind('<Left>', self._on_run_left)
+        self._master.bind('<A>', self._on_run_left)
         # duck
-        self._master.bind('<s>', lambda event: self._duck())
-        self._master.bind('<Down>', lambda event: self._duck())
-        self._master.bind('<S>', lambda event: self._duck())
+        self._master.bind('<s>', self._on_duck)
+        self._master.bind('<Down>', self._on_duck)
+        self._master.bind('<S>', self._on_duck)
         # move right
-        self._master.bind('<d>', lambda event: self._move(50, 0))
-        self._master.bind('<Right>', lambda event: self._move(500, 0))
-        self._master.bind('<D>', lambda event: self._move(500, 0))
+        self._master.bind('<d>', self._on_walk_right)
+        self._master.bind('<Right>', self._on_run_right)
+        self._master.bind('<D>', self._on_run_right)
 
     def status_bar(self):
         self._status_bar.destroy()
@@ -283,40 +344,248 @@ class MarioApp:
         w = tk.Label(self._status_bar, text='Score: ' + str(self._player.get_score()))
         w.pack(side="bottom")
 
+    def _clear_drawn(self):
+        """Delete all canvas items and forget every drawn entity."""
+        # Canvas items are kept between frames and only updated when their entity
+        # changes. Moving entities are stored as parallel lists, where the index of
+        # an entity's shape is given by self._drawn_index.
+        self._drawn_index: Dict[pymunk.Shape, int] = {}
+        self._drawn_shapes: List[pymunk.Shape] = []
+        self._drawn_bodies: List[pymunk.Body] = []
+        # the centre of each shape relative to the position of its body
+        self._centre_x: List[float] = []
+        self._centre_y: List[float] = []
+        # the canvas items of each shape and where they were last drawn
+        self._canvas_ids: List[List[int]] = []
+        self._pos_x: List[int] = []
+        self._pos_y: List[int] = []
+        # callbacks giving the current image of entities whose image can change
+        self._image_getters: List[Optional[Callable[[], tk.PhotoImage]]] = []
+        self._drawn_images: List[Optional[tk.PhotoImage]] = []
+
+        self._drawn_columns = (self._drawn_shapes, self._drawn_bodies,
+                               self._centre_x, self._centre_y,
+                               self._canvas_ids, self._pos_x, self._pos_y,
+                               self._image_getters, self._drawn_images)
+
+        # Static entities never move in the world, so they are kept sorted by their
+        # left edge to find the ones within the view. Their canvas items are only
+        # created once they come into view, are tagged "static" and moved together
+        # when the view scrolls, and are hidden rather than deleted once out of view.
+        self._static_set: Set[pymunk.Shape] = set()
+        self._static_shapes: List[pymunk.Shape] = []
+        self._static_lefts: List[float] = []
+        self._static_ids: Dict[pymunk.Shape, List[int]] = {}
+        self._static_images: Dict[pymunk.Shape, Tuple[Callable[[], tk.PhotoImage], tk.PhotoImage]] = {}
+        self._shown_statics: Set[pymunk.Shape] = set()
+        # the static offset at the time each hidden static entity was hidden
+        self._hidden_offsets: Dict[pymunk.Shape, int] = {}
+        self._static_offset = 0
+        self._statics_changed = False
+
+        if self._view is not None:
+            self._view.delete(tk.ALL)
+
+    def _get_image_getter(self, shape: pymunk.Shape) -> Optional[Callable[[], tk.PhotoImage]]:
+        """Return a callback giving the current image of a shape's entity, or None
+        if the image of the entity never changes.
+        """
+        thing = shape.object
+        if isinstance(thing, Player):
+            return partial(self._renderer.get_player_image, shape)
+        if isinstance(thing, MysteryBlock):
+            return partial(self._renderer.get_mystery_block_image, thing)
+        return None
+
+    def _add_drawn(self, shape: pymunk.Shape, offset: Tuple[int, int]):
+        """Start tracking the canvas items of a shape, drawing it if it moves."""
+        body = shape.body
+        left = shape.bb.left
+
+        if body.body_type == pymunk.Body.STATIC:
+            index = bisect_right(self._static_lefts, left)
+            self._static_lefts.insert(index, left)
+            self._static_shapes.insert(index, shape)
+            self._static_set.add(shape)
+            self._statics_changed = True
+            return
+
+        centre = shape.bb.center()
+        image_getter = self._get_image_getter(shape)
+
+        self._drawn_index[shape] = len(self._drawn_shapes)
+        self._drawn_shapes.append(shape)
+        self._drawn_bodies.append(body)
+        self._centre_x.append(centre.x - body.position.x)
+        self._centre_y.append(centre.y - body.position.y)
+        self._canvas_ids.append(self._renderer.draw(shape.object, shape, self._view, offset))
+        self._pos_x.append(int(centre.x + offset[0]))
+        self._pos_y.append(int(centre.y))
+        self._image_getters.append(image_getter)
+        self._drawn_images.append(image_getter() if image_getter else None)
+
+    def _remove_drawn(self, shape: pymunk.Shape):
+        """Delete the canvas items of a shape and stop tracking it."""
+        if shape in self._static_set:
+            index = self._static_shapes.index(shape, bisect_left(self._static_lefts, shape.bb.left))
+            del self._static_shapes[index]
+            del self._static_lefts[index]
+            self._static_set.remove(shape)
+            self._shown_statics.discard(shape)
+            self._hidden_offsets.pop(shape, None)
+            self._static_images.pop(shape, None)
+            for item in self._static_ids.pop(shape, ()):
+                self._view.delete(item)
+            return
+
+        index = self._drawn_index.pop(shape)
+        for item in self._canvas_ids[index]:
+            self._view.delete(item)
+
+        # move the last entity into the removed entity's place
+        last = len(self._drawn_shapes) - 1
+        if index != last:
+            self._drawn_index[self._drawn_shapes[last]] = index
+        for column in self._drawn_columns:
+            column[index] = column[last]
+            column.pop()
+
+    def _show_static(self, shape: pymunk.Shape, offset: Tuple[int, int]):
+        """Show the canvas items of a static shape, drawing them the first time."""
+        if shape in self._hidden_offsets:
+            dx = offset[0] - self._hidden_offsets.pop(shape)
+            for item in self._static_ids[shape]:
+                if dx:
+                    self._view.move(item, dx, 0)
+                self._view.itemconfigure(item, state=tk.NORMAL)
+                self._view.addtag_withtag("static", item)
+            return
+
+        ids = self._renderer.draw(shape.object, shape, self._view, offset)
+        for item in ids:
+            self._view.addtag_withtag("static", item)
+        self._static_ids[shape] = ids
+
+        image_getter = self._get_image_getter(shape)
+        if image_getter:
+            self._static_images[shape] = (image_getter, image_getter())
+
+    def _hide_static(self, shape: pymunk.Shape):
+        """Hide the canvas items of a static shape and stop them scrolling."""
+        for item in self._static_ids[shape]:
+            self._view.itemconfigure(item, state=tk.HIDDEN)
+            self._view.dtag(item, "static")
+        self._hidden_offsets[shape] = self._static_offset
+
+    def _cull_statics(self, offset: Tuple[int, int]):
+        """Show only the static shapes which are within the view."""
+        view_left = -offset[0] - BLOCK_SIZE
+        view_right = view_left + self._screen_width + 2 * BLOCK_SIZE
+
+        start = bisect_left(self._static_lefts, view_left)
+        stop = bisect_right(self._static_lefts, view_right)
+        in_view = set(self._static_shapes[start:stop])
+
+        for shape in self._shown_statics - in_view:
+            self._hide_static(shape)
+        for shape in in_view - self._shown_statics:
+            self._show_static(shape, offset)
+
+        self._shown_statics = in_view
+        self._statics_changed = False
+
     def redraw(self):
-        """Redraw all the entities in the game canvas."""
-        self._view.delete(tk.ALL)
+        """Update the canvas items of all the entities in the game canvas.
 
-        self._view.draw_entities(self._world.get_all_things())
+        Items are created the first time an entity is drawn, moved when its
+        position changes and deleted once it has been removed from the world.
+        Static entities outside of the view are hidden.
+        All of the changes are flushed to the screen at once, at the end.
+        """
+        offset = self._view.get_offset()
+
+        shapes = set(self._world.get_space().shapes)
+        drawn = self._drawn_index.keys() | self._static_set
+        for shape in drawn - shapes:
+            self._remove_drawn(shape)
+
+        # scroll every static item at once, before new items are drawn in place
+        if offset[0] != self._static_offset:
+            self._view.move("static", offset[0] - self._static_offset, 0)
+            self._static_offset = offset[0]
+            self._statics_changed = True
+
+        for shape in shapes - drawn:
+            if shape.object:
+                self._add_drawn(shape, offset)
+
+        if self._statics_changed:
+            self._cull_statics(offset)
+
+        for shape, (image_getter, last_image) in self._static_images.items():
+            image = image_getter()
+            if image is not last_image:
+                for item in self._static_ids[shape]:
+                    self._view.itemconfigure(item, image=image)
+                self._static_images[shape] = (image_getter, image)
+
+        pos_x, pos_y = self._pos_x, self._pos_y
+        centre_x, centre_y = self._centre_x, self._centre_y
+        for i, body in enumerate(self._drawn_bodies):
+            position = body.position
+            x = int(position.x + centre_x[i] + offset[0])
+            y = int(position.y + centre_y[i])
+
+            image_getter = self._image_getters[i]
+            image = image_getter() if image_getter else None
+            last_image = self._drawn_images[i]
+
+            if x == pos_x[i] and y == pos_y[i] and image is last_image:
+                continue
+
+            for item in self._canvas_ids[i]:
+                self._view.move(item, x - pos_x[i], y - pos_y[i])
+                if image is not last_image:
+                    self._view.itemconfigure(item, image=image)
+            pos_x[i] = x
+            pos_y[i] = y
+            self._drawn_images[i] = image
+
+        # repaint the frame's changes together rather than as they were queued
+        self._master.update_idletasks()
 
     def scroll(self):
         """Scroll the view along with the player in the center unless
         they are near the left or right boundaries
         """
         x_position = self._player.get_position()[0]
-        half_screen = self._master.winfo_width() / 2
-        world_size = self._world.get_pixel_size()[0] - half_screen
 
-        # Left side
-        if x_position <= half_screen:
-            self._view.set_offset((0, 0))
+        # keep the offset whole so that static items are scrolled by whole pixels
+        offset_x = int(scroll_offset(x_position, self._half_screen, self._world_width))
+        if offset_x != self._view.get_offset()[0]:
+            self._view.set_offset((offset_x, 0))
 
-        # Between left and right sides
-        elif half_screen <= x_position <= world_size:
-            self._view.set_offset((half_screen - x_position, 0))
+    def _physics_tick(self):
+        """Step the world physics at a fixed rate and update the game state.
 
-        # Right side
-        elif x_position >= world_size:
-            self._view.set_offset((half_screen - world_size, 0))
+        Each tick takes as many steps of PHYSICS_STEP as fit within the real time
+        that has passed since the previous tick, up to MAX_PHYSICS_STEPS.
+        """
+        now = time.perf_counter()
+        self._accumulator += now - self._last_tick
+        self._last_tick = now
 
-    def step(self):
-        """Step the world physics and redraw the canvas."""
-        """SMOOTH OPERATOR ..... SMOOOOTH OPERATION"""
         data = (self._world, self._player)
-        self._world.step(data)
-        self.scroll()
-        self.redraw()
-        self._master.after(10, self.step)
+        steps = 0
+        while self._accumulator >= PHYSICS_STEP and steps < MAX_PHYSICS_STEPS:
+            self._world.step(data)
+            self._accumulator -= PHYSICS_STEP
+            steps += 1
+        # Drop any backlog that couldn't be caught up on rather than letting it grow
+        if self._accumulator >= PHYSICS_STEP:
+            self._accumulator = 0.
+        self._master.after(PHYSICS_INTERVAL, self._physics_tick)
+
         #updates the status bar if change in health is detected
         if self._player.get_health() == self._health:
             pass
@@ -337,12 +606,42 @@ class MarioApp:
             else:
                 pass
 
+    def _render_tick(self):
+        """Scroll and redraw the canvas, then schedule the next redraw.
+
+        The next redraw waits for tkinter to become idle so that it is coalesced
+        with tkinter's own repainting. Nothing is redrawn if nothing has changed.
+        """
+        frame_state = self._frame_state()
+        if self._world_dirty or frame_state != self._last_frame_state:
+            self._world_dirty = False
+            self._last_frame_state = frame_state
+            self.scroll()
+            self.redraw()
+        self._master.after(RENDER_INTERVAL, self._master.after_idle, self._render_tick)
+
+    def _frame_state(self) -> Tuple[int, Tuple[Tuple[int, int], ...]]:
+        """Summarise the state of the world which the canvas depends on.
+
+        If the state is unchanged since the last redraw, the canvas is already up
+        to date, as long as the world isn't dirty.
+
+        Returns:
+            (tuple<int, tuple<tuple<int, int>, ...>>): The number of shapes in the
+                world and the whole pixel positions of all drawn moving entities.
+        """
+        positions = tuple((int(body.position.x), int(body.position.y))
+                          for body in self._drawn_bodies)
+        return len(self._world.get_space().shapes), positions
+
     def on_death(self):
         """
         A popup window asking if player wants to continue or exit
         """
         self._death_action = True
-        death_popup = tk.Tk()
+        death_popup = tk.Toplevel(self._master)
+        death_popup.transient(self._master)
+        death_popup.grab_set()
         death_popup.geometry("300x200")
         death_popup.configure(background="light blue")
         death_popup.title("You dead")
@@ -355,6 +654,33 @@ class MarioApp:
 
 
 
+    def _on_resize(self, event: tk.Event):
+        # the window's bindings also receive the configure events of its children
+        if event.widget is not self._master or event.width == self._screen_width:
+            return
+        self._screen_width = event.width
+        self._half_screen = event.width / 2
+        self._statics_changed = True
+        self._world_dirty = True
+
+    def _on_jump(self, event: tk.Event):
+        self._jump()
+
+    def _on_walk_left(self, event: tk.Event):
+        self._move(-50, 0)
+
+    def _on_run_left(self, event: tk.Event):
+        self._move(-500, 0)
+
+    def _on_duck(self, event: tk.Event):
+        self._duck()
+
+    def _on_walk_right(self, event: tk.Event):
+        self._move(50, 0)
+
+    def _on_run_right(self, event: tk.Event):
+        self._move(500, 0)
+
     def _move(self, dx, dy):
         self._player.set_velocity((dx, dy))
 
@@ -366,20 +692,25 @@ class MarioApp:
         return True
 
     def _setup_collision_handlers(self):
-        self._world.add_collision_handler("player", "item", on_begin=self._handle_player_collide_item)
-        self._world.add_collision_handler("player", "block", on_begin=self._handle_player_collide_block,
-                                          on_separate=self._handle_player_separate_block)
-        self._world.add_collision_handler("player", "mob", on_begin=self._handle_player_collide_mob)
-        self._world.add_collision_handler("mob", "block", on_begin=self._handle_mob_collide_block)
-        self._world.add_collision_handler("mob", "mob", on_begin=self._handle_mob_collide_mob)
-        self._world.add_collision_handler("mob", "item", on_begin=self._handle_mob_collide_item)
+        # (collision type a, collision type b, on_begin, on_separate)
+        collision_handlers = [
+            ("player", "item", self._handle_player_collide_item, None),
+            ("player", "block", self._handle_player_collide_block, self._handle_player_separate_block),
+            ("player", "mob", self._handle_player_collide_mob, None),
+            ("mob", "block", self._handle_mob_collide_block, None),
+            ("mob", "mob", self._handle_mob_collide_mob, None),
+            ("mob", "item", self._handle_mob_collide_item, None)
+        ]
+        for type_a, type_b, on_begin, on_separate in collision_handlers:
+            self._world.add_collision_handler(type_a, type_b, on_begin=on_begin, on_separate=on_separate)
 
     def _handle_mob_collide_block(self, mob: Mob, block: Block, data,
                                   arbiter: pymunk.Arbiter) -> bool:
-        if mob.get_id() == "fireball":
+        if mob.get_type_id() == MobType.FIREBALL:
             if block.get_id() == "brick":
                 self._world.remove_block(block)
             self._world.remove_mob(mob)
+            self._world_dirty = True
         return True
 
     def _handle_mob_collide_item(self, mob: Mob, block: Block, data,
@@ -388,9 +719,10 @@ class MarioApp:
 
     def _handle_mob_collide_mob(self, mob1: Mob, mob2: Mob, data,
                                 arbiter: pymunk.Arbiter) -> bool:
-        if mob1.get_id() == "fireball" or mob2.get_id() == "fireball":
+        if mob1.get_type_id() == MobType.FIREBALL or mob2.get_type_id() == MobType.FIREBALL:
             self._world.remove_mob(mob1)
             self._world.remove_mob(mob2)
+            self._world_dirty = True
 
         return False
 
@@ -415,17 +747,20 @@ class MarioApp:
 
         dropped_item.collect(self._player)
         self._world.remove_item(dropped_item)
+        self._world_dirty = True
         return False
 
     def _handle_player_collide_block(self, player: Player, block: Block, data,
                                      arbiter: pymunk.Arbiter) -> bool:
 
         block.on_hit(arbiter, (self._world, player))
+        self._world_dirty = True
         return True
 
     def _handle_player_collide_mob(self, player: Player, mob: Mob, data,
                                    arbiter: pymunk.Arbiter) -> bool:
         mob.on_hit(arbiter, (self._world, player))
+        self._world_dirty = True
         return True
 
     def _handle_player_separate_block(self, player: Player, block: Block, data,
@@ -9,6 +9,7 @@ __copyright__ = "The University of Queensland, 2019"
 import random
 import pymunk
 import time
+from enum import IntEnum
 
 from game.entity import DynamicEntity
 from game.util import get_collision_direction
@@ -18,6 +19,12 @@ MOB_DEFAULT_TEMPO = 30
 MOB_DEFAULT_WEIGHT = 100
 
 
+class MobType(IntEnum):
+    """Unique ids for each kind of mob, cheaper to compare than mob id strings"""
+    CLOUD = 0
+    FIREBALL = 1
+
+
 class Mob(DynamicEntity):
     """An abstract representation of a creature in the sandbox game
 
@@ -25,6 +32,7 @@ class Mob(DynamicEntity):
 
     Should not be instantiated directly"""
     _type = 5
+    _type_id = None
 
     def __init__(self, mob_id, size, weight=MOB_DEFAULT_TEMPO,
                  tempo=MOB_DEFAULT_TEMPO, max_health=20):
@@ -55,6 +63,10 @@ class Mob(DynamicEntity):
         """(str) Returns the unique id for this type of mob"""
         return self._id
 
+    def get_type_id(self):
+        """(MobType) Returns the kind of this mob, or None if it isn't a known kind"""
+        return self._type_id
+
     def get_size(self):
         """(str) Returns the physical (x, y) size of this mob"""
         return self._size
@@ -99,6 +111,7 @@ class Fireball(Mob):
     When colliding with the player it will damage the player and explode.
     """
     _id = "fireball"
+    _type_id = MobType.FIREBALL
 
     def __init__(self):
         super().__init__(self._id, size=(16, 16), weight=300, tempo=0)
@@ -114,6 +127,7 @@ class CloudMob(Mob):
     will fire a fireball at them.
     """
     _id = "cloud"
+    _type_id = MobType.CLOUD
     MAX_DISTANCE = 20
 
     def __init__(self, fire_range=10):
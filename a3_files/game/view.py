@@ -113,22 +113,22 @@ class ViewRenderer:
     def _draw_block(self, instance: Block, shape: pymunk.Shape,
                     view: tk.Canvas, offset: Tuple[int, int]) -> List[int]:
         image = self.load_image(self._block_images[instance.get_id()])
-        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y,
-                                  image=image, tags="block")]
+        x, y = shape.bb.center()
+        return [view.create_image(int(x + offset[0]), int(y), image=image, tags="block")]
 
     @draw.register(DroppedItem)
     def _draw_physical_item(self, instance: DroppedItem, shape: pymunk.Shape,
                             view: tk.Canvas, offset: Tuple[int, int]) -> List[int]:
         image = self.load_image(self._item_images[instance.get_id()])
-        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y,
-                                  image=image, tags="item")]
+        x, y = shape.bb.center()
+        return [view.create_image(int(x + offset[0]), int(y), image=image, tags="item")]
 
     @draw.register(Mob)
     def _draw_mob(self, instance: Mob, shape: pymunk.Shape,
                         view: tk.Canvas, offset: Tuple[int, int]) -> List[int]:
         image = self.load_image(self._mob_images[instance.get_id()])
-        return [view.create_image(shape.bb.center().x + offset[0], shape.bb.center().y,
-                                  image=image, tags="mob")]
+        x, y = shape.bb.center()
+        return [view.create_image(int(x + offset[0]), int(y), image=image, tags="mob")]
 
 
 class GameView(tk.Canvas):
@@ -4,10 +4,14 @@ tokens of entities.
 
 __version__ = "1.1.0"
 
+import re
 from typing import Tuple, Callable, Iterable
 
 from game.world import World
 
+# Matches every character in a line of a level which represents an entity
+ENTITY_PATTERN = re.compile(r"[^ ]")
+
 
 class WorldBuilder:
     """World builder class that can be used to construct a world from
@@ -181,10 +185,8 @@ def load_world(builder: WorldBuilder, filename: str, *args):
     """
     level = load_level(filename)
     for y, line in enumerate(level.split('\n')):
-        for x, character in enumerate(line):
-            if character in ('\n', ' '):
-                continue
-
-            builder.add_entity(character, x, y, *args)
+        # let the regex engine skip over the empty space between entities
+        for match in ENTITY_PATTERN.finditer(line):
+            builder.add_entity(match.group(), match.start(), y, *args)
 
     return builder.build()